@@ -0,0 +1,85 @@
+"""Import-time budget check for the app factory.
+
+Runs `create_app()` in a fresh interpreter and fails if it takes longer than
+the wall-time budget, imports more modules than the module budget, or pulls in
+anything that should stay lazy (controllers, DB connections).
+
+Usage (from backend/):
+    python scripts/check_cold_start.py --max-seconds 1.0 --max-modules 550
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported until a request needs them
+LAZY_MODULES = (
+    'src.controllers.auth_controller',
+    'src.controllers.media_controller',
+    'src.controllers.user',
+    'src.controllers.social_controller',
+    'src.controllers.trending_controller',
+)
+
+PROBE = """
+import json, sys, time
+start_modules = len(sys.modules)
+start = time.perf_counter()
+from src import create_app
+app = create_app()
+elapsed = time.perf_counter() - start
+from src.models.db import db
+with app.app_context():
+    pool = db.engine.pool
+    connections = pool.checkedout() + pool.checkedin()
+print(json.dumps({
+    'seconds': elapsed,
+    'modules': len(sys.modules) - start_modules,
+    'loaded': [name for name in %r if name in sys.modules],
+    'connections': connections,
+}))
+""" % (LAZY_MODULES,)
+
+
+def measure():
+    env = dict(os.environ)
+    # Placeholder credentials: create_app() must not need a reachable database
+    env.setdefault('DB_USER', 'cold_start')
+    env.setdefault('DB_PASSWORD', 'cold_start')
+    env.setdefault('SECRET_KEY', 'cold_start')
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-seconds', type=float, default=1.0)
+    parser.add_argument('--max-modules', type=int, default=550)
+    args = parser.parse_args()
+
+    result = measure()
+    print(f"create_app(): {result['seconds']:.3f}s, {result['modules']} modules imported")
+
+    failures = []
+    if result['seconds'] > args.max_seconds:
+        failures.append(f"wall time {result['seconds']:.3f}s exceeds {args.max_seconds}s")
+    if result['modules'] > args.max_modules:
+        failures.append(f"{result['modules']} modules exceeds {args.max_modules}")
+    if result['loaded']:
+        failures.append(f"eagerly imported: {', '.join(result['loaded'])}")
+    if result['connections']:
+        failures.append(f"{result['connections']} database connections opened at startup")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
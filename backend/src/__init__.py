@@ -1,26 +1,49 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-import os
+import click
+
+def create_app(settings=None):
+    """Build the Flask app.
+
+    Nothing here touches the database: the engine connects on the first query,
+    and controllers are imported by the routes on first request.
+    """
+    from .config import get_settings
+    from .models.db import db
+    from .middleware import profiler, query_stats
+
+    settings = settings or get_settings()
 
-def create_app():
     app = Flask(__name__)
     
     # CORS settings - use environment variable
-    frontend_url = os.environ.get('FRONTEND_URL', 'http://localhost:8080')
     CORS(app, 
          resources={r"/api/*": {"origins": [
              "https://media-minder-frontend.vercel.app",
-             frontend_url, 
+             settings.frontend_url, 
              "http://localhost:8080"
          ]}},
          supports_credentials=True,
-         allow_headers=["Content-Type", "Authorization"],
+         allow_headers=["Content-Type", "Authorization", "X-Profile"],
+         expose_headers=query_stats.RESPONSE_HEADERS,
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"])
     
-    # Load configuration with correct path
-    config_path = os.path.join(os.path.dirname(__file__), 'config', 'config.py')
-    app.config.from_pyfile(config_path)
+    # Load configuration from the validated settings
+    app.config.from_mapping(settings.to_flask_config())
+    
+    # Initialize SQLAlchemy with the Flask app
+    db.init_app(app)
+    
+    # In-memory trending, fed by UserMedia writes
+    from .services.trending import trending
+    trending.init_app(app)
+    
+    # Per-request query counting / N+1 detection and on-demand profiling.
+    # Only statements run inside a request are counted, so trending's
+    # background checkpoints never show up in a request's stats
+    query_stats.init_app(app)
+    profiler.init_app(app)
     
     # Add these lines for better error handling
     app.config['PROPAGATE_EXCEPTIONS'] = True
@@ -49,10 +72,43 @@ def create_app():
     from .routes.auth import auth_bp
     from .routes.media import media_bp
     from .routes.user_controller import user_bp
+    from .routes.social import social_bp
+    from .routes.trending import trending_bp
 
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(media_bp, url_prefix='/api/media')
     app.register_blueprint(user_bp, url_prefix='/api/user')
+    app.register_blueprint(social_bp, url_prefix='/api/social')
+    app.register_blueprint(trending_bp, url_prefix='/api/trending')
+    
+    # Explicit connectivity check, kept out of startup
+    @app.cli.command('check-db')
+    def check_db_command():
+        from sqlalchemy import text
+        result = db.session.execute(text("SELECT COUNT(*) FROM public.users")).scalar()
+        click.echo(f"Database connection successful. Found {result} users.")
+    
+    @app.cli.command('trending-checkpoint')
+    def trending_checkpoint_command():
+        trending.checkpoint()
+        click.echo("Trending checkpoint written.")
+    
+    # Periodic maintenance, e.g. scheduled as `flask gc-media`
+    @app.cli.command('gc-media')
+    @click.option('--batch-size', type=int, default=None, help='Rows per batch')
+    @click.option('--max-batches', type=int, default=None, help='Batches per step (default: until done)')
+    def gc_media_command(batch_size, max_batches):
+        from .services.cleanup import run_media_gc
+        stats = run_media_gc(batch_size=batch_size, max_batches=max_batches)
+        click.echo(f"Media GC: {stats}")
+    
+    @app.cli.command('trim-timelines')
+    @click.option('--batch-size', type=int, default=None, help='Owners per batch')
+    @click.option('--max-batches', type=int, default=None, help='Batches per run (default: until done)')
+    def trim_timelines_command(batch_size, max_batches):
+        from .services.activity import trim_timelines
+        trimmed = trim_timelines(batch_size or app.config['TIMELINE_TRIM_BATCH_SIZE'], max_batches)
+        click.echo(f"Trimmed {trimmed} timeline entries.")
     
     @app.errorhandler(500)
     def handle_500_error(e):
@@ -1,36 +1,106 @@
 import os
-from dotenv import load_dotenv
 from pathlib import Path
-import re
-import sys
-print(f"Python default encoding: {sys.getdefaultencoding()}")
 
+# Location of the backend .env file
+ENV_PATH = Path(__file__).parents[2] / ".env"
 
-# Determine the correct path to your .env file
-env_path = Path(__file__).parents[2] / ".env"
-load_dotenv(dotenv_path=env_path)
+# Variables the app cannot start without
+REQUIRED_VARS = ("DB_USER", "DB_PASSWORD", "SECRET_KEY")
 
-# Database configuration with safe fallbacks
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = os.getenv("DB_PORT", "5432")
-DB_NAME = os.getenv("DB_NAME", "neondb")
 
-# Convert pooled connection to unpooled by removing "-pooler" part
-if "-pooler" in DB_HOST:
-    DB_HOST = DB_HOST.replace("-pooler", "")
+class Settings:
+    """Validated application settings, read once from the environment."""
 
-# JWT configuration
-SECRET_KEY = os.getenv("SECRET_KEY")
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", SECRET_KEY)
+    def __init__(self, env):
+        missing = [name for name in REQUIRED_VARS if not env.get(name)]
+        if missing:
+            raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
 
-# Flask configuration
-DEBUG = os.getenv("FLASK_DEBUG", "True").lower() == "true"
+        # Environment
+        self.is_production = env.get("FLASK_ENV") == "production"
+        self.debug = env.get("FLASK_DEBUG", "True").lower() == "true"
+        self.frontend_url = env.get("FRONTEND_URL", "http://localhost:8080")
 
-# SQLAlchemy configuration
-SQLALCHEMY_DATABASE_URI = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?client_encoding=utf8&sslmode=require"
-SQLALCHEMY_TRACK_MODIFICATIONS = False
+        # Database configuration with safe fallbacks
+        self.db_user = env["DB_USER"]
+        self.db_password = env["DB_PASSWORD"]
+        self.db_host = env.get("DB_HOST", "localhost")
+        self.db_port = env.get("DB_PORT", "5432")
+        self.db_name = env.get("DB_NAME", "neondb")
 
-# Print connection string (for debugging) - hide the password
-print(f"Connecting to database: postgresql://{DB_USER}:***@{DB_HOST}:{DB_PORT}/{DB_NAME}")
\ No newline at end of file
+        # Convert pooled connection to unpooled by removing "-pooler" part
+        if "-pooler" in self.db_host:
+            self.db_host = self.db_host.replace("-pooler", "")
+
+        # JWT configuration
+        self.secret_key = env["SECRET_KEY"]
+        self.jwt_secret_key = env.get("JWT_SECRET_KEY", self.secret_key)
+
+        # Batch sizes for bulk deletes (account deletion, media garbage collection)
+        self.delete_batch_size = int(env.get("DELETE_BATCH_SIZE", "500"))
+        self.media_gc_batch_size = int(env.get("MEDIA_GC_BATCH_SIZE", "500"))
+
+        # Activity feed: users with at least this many followers are merged in
+        # at read time instead of being fanned out to every follower
+        self.feed_fanout_max_followers = int(env.get("FEED_FANOUT_MAX_FOLLOWERS", "10000"))
+        self.timeline_max_entries = int(env.get("TIMELINE_MAX_ENTRIES", "500"))
+        # Owners per transaction in the periodic `flask trim-timelines` job
+        self.timeline_trim_batch_size = int(env.get("TIMELINE_TRIM_BATCH_SIZE", "500"))
+
+        # In-house trending: sliding window of time buckets, top-K per media type
+        self.trending_window_hours = int(env.get("TRENDING_WINDOW_HOURS", "168"))
+        self.trending_bucket_hours = int(env.get("TRENDING_BUCKET_HOURS", "6"))
+        self.trending_top_k = int(env.get("TRENDING_TOP_K", "20"))
+        self.trending_checkpoint_seconds = int(env.get("TRENDING_CHECKPOINT_SECONDS", "300"))
+
+        # Query diagnostics: per-request statement counts replace SQL echo,
+        # which is now opt-in even in development
+        self.sql_echo = env.get("SQLALCHEMY_ECHO", "False").lower() == "true"
+        self.query_stats_enabled = env.get("QUERY_STATS_ENABLED", "True").lower() == "true"
+        self.n_plus_one_threshold = int(env.get("N_PLUS_ONE_THRESHOLD", "5"))
+
+        # Request profiling: sampled, or triggered with an X-Profile header
+        # (any value outside production, PROFILE_TOKEN in production)
+        self.profile_sample_rate = float(env.get("PROFILE_SAMPLE_RATE", "0"))
+        self.profile_token = env.get("PROFILE_TOKEN")
+        self.profile_dir = env.get("PROFILE_DIR", str(Path(__file__).parents[2] / "profiles"))
+
+    @property
+    def database_uri(self):
+        return (f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+                "?client_encoding=utf8&sslmode=require")
+
+    def to_flask_config(self):
+        return {
+            'DEBUG': self.debug,
+            'SECRET_KEY': self.secret_key,
+            'JWT_SECRET_KEY': self.jwt_secret_key,
+            'SQLALCHEMY_DATABASE_URI': self.database_uri,
+            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+            'SQLALCHEMY_ECHO': self.sql_echo,
+            'DELETE_BATCH_SIZE': self.delete_batch_size,
+            'MEDIA_GC_BATCH_SIZE': self.media_gc_batch_size,
+            'FEED_FANOUT_MAX_FOLLOWERS': self.feed_fanout_max_followers,
+            'TIMELINE_MAX_ENTRIES': self.timeline_max_entries,
+            'TIMELINE_TRIM_BATCH_SIZE': self.timeline_trim_batch_size,
+            'TRENDING_WINDOW_HOURS': self.trending_window_hours,
+            'TRENDING_BUCKET_HOURS': self.trending_bucket_hours,
+            'TRENDING_TOP_K': self.trending_top_k,
+            'TRENDING_CHECKPOINT_SECONDS': self.trending_checkpoint_seconds,
+            'QUERY_STATS_ENABLED': self.query_stats_enabled,
+            # Per-request query counts are only exposed outside production
+            'QUERY_STATS_HEADERS': not self.is_production,
+            'N_PLUS_ONE_THRESHOLD': self.n_plus_one_threshold,
+            'PROFILE_SAMPLE_RATE': self.profile_sample_rate,
+            'PROFILE_TOKEN': self.profile_token,
+            'PROFILE_ALLOW_HEADER': not self.is_production,
+            'PROFILE_DIR': self.profile_dir,
+        }
+
+
+def load_settings(env_path=ENV_PATH):
+    """Load the .env file (without overriding real env vars) and build Settings."""
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path=env_path)
+    return Settings(os.environ)
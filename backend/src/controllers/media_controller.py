@@ -5,6 +5,7 @@ from ..models.db import db
 from ..models.user import User
 from ..models.media import Media
 from ..models.user_media import UserMedia
+from ..services.activity import record_activity
 
 def get_user_media():
     user_id = get_jwt_identity()
@@ -50,8 +51,12 @@ def add_media_item():
         return jsonify({"error": "Missing required fields"}), 400
     
     try:
-        # Check if media already exists in our database
-        media = Media.query.filter_by(external_id=data['media_id']).first()
+        # Check if media already exists in our database. The key-share lock
+        # keeps the media GC from deleting it before our user_media row
+        # commits; everything below runs in this one transaction
+        media = Media.query.filter_by(external_id=data['media_id']).with_for_update(
+            read=True, key_share=True
+        ).first()
         
         # If media doesn't exist, create it
         if not media:
@@ -67,7 +72,7 @@ def add_media_item():
                 image_url=data.get('poster_path', '')
             )
             db.session.add(media)
-            db.session.commit()
+            db.session.flush()
             print(f"Created new media: {media.id} - {media.title}")
         
         # Check if user already has this media in their list
@@ -78,6 +83,8 @@ def add_media_item():
         
         if existing_user_media:
             # Update status if it already exists
+            if existing_user_media.status != data['status']:
+                record_activity(user_id, media.id, 'status_changed', status=data['status'])
             existing_user_media.status = data['status']
             db.session.commit()
             print(f"Updated status to {data['status']} for media {media.id}")
@@ -90,6 +97,7 @@ def add_media_item():
                 status=data['status']
             )
             db.session.add(user_media)
+            record_activity(user_id, media.id, 'added', status=data['status'])
             db.session.commit()
             print(f"Added new user_media: {user_media.id} with status {data['status']}")
             return jsonify(user_media.to_dict()), 201
@@ -110,6 +118,12 @@ def update_media_item(item_id):
     if not user_media:
         return jsonify({'error': 'Media item not found'}), 404
     
+    # Record feed activity for status and rating changes
+    if 'status' in data and data['status'] != user_media.status:
+        record_activity(user_id, user_media.media_id, 'status_changed', status=data['status'])
+    if 'rating' in data and data['rating'] is not None and data['rating'] != user_media.rating:
+        record_activity(user_id, user_media.media_id, 'rated', rating=data['rating'])
+    
     # Update fields
     allowed_fields = ['status', 'rating', 'review']
     for field in allowed_fields:
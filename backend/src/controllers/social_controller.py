@@ -0,0 +1,48 @@
+from flask import request, jsonify
+from flask_jwt_extended import get_jwt_identity
+from ..models.db import db
+from ..models.user import User
+from ..services.activity import follow_user, unfollow_user, get_feed
+
+MAX_FEED_PAGE_SIZE = 50
+
+def follow(user_id):
+    current_user_id = int(get_jwt_identity())
+    if user_id == current_user_id:
+        return jsonify({'error': 'You cannot follow yourself'}), 400
+    
+    followee = User.query.get(user_id)
+    if not followee:
+        return jsonify({'error': 'User not found'}), 404
+    if followee.is_private:
+        return jsonify({'error': 'This profile is private'}), 403
+    
+    try:
+        if not follow_user(current_user_id, followee):
+            return jsonify({'message': 'Already following this user'}), 200
+        return jsonify({'message': f'You are now following {followee.username}'}), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+def unfollow(user_id):
+    current_user_id = get_jwt_identity()
+    
+    try:
+        if not unfollow_user(current_user_id, user_id):
+            return jsonify({'error': 'You are not following this user'}), 404
+        return jsonify({'message': 'Unfollowed successfully'}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+def feed():
+    user_id = get_jwt_identity()
+    before = request.args.get('before', type=int)
+    limit = min(request.args.get('limit', 20, type=int), MAX_FEED_PAGE_SIZE)
+    
+    events, next_before = get_feed(user_id, before=before, limit=max(limit, 1))
+    return jsonify({
+        'items': [event.to_dict() for event in events],
+        'next_before': next_before
+    }), 200
@@ -0,0 +1,18 @@
+from flask import request, jsonify
+from ..services.trending import trending
+
+MEDIA_TYPES = ('movie', 'series', 'book')
+
+def get_trending():
+    media_type = request.args.get('type')
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        limit = max(limit, 1)
+    
+    if media_type and media_type not in MEDIA_TYPES:
+        return jsonify({'error': f"Invalid type, expected one of: {', '.join(MEDIA_TYPES)}"}), 400
+    
+    # Served from memory: O(K) per media type, no user_media scan
+    if media_type:
+        return jsonify({media_type: trending.get_trending(media_type, limit)}), 200
+    return jsonify({t: trending.get_trending(t, limit) for t in MEDIA_TYPES}), 200
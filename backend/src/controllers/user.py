@@ -2,6 +2,7 @@ from flask import request, jsonify
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from ..models.db import db
 from ..models.user import User
+from ..services.cleanup import delete_user_account
 
 @jwt_required()
 def get_profile():
@@ -64,8 +65,7 @@ def delete_account():
         return jsonify({'error': 'User not found'}), 404
     
     try:
-        db.session.delete(user)
-        db.session.commit()
+        delete_user_account(user.id)
         return jsonify({'message': 'Account deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
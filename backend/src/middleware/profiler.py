@@ -0,0 +1,64 @@
+"""On-demand cProfile of individual requests.
+
+A request is profiled when it is sampled (PROFILE_SAMPLE_RATE) or asks for it
+with an X-Profile header. Outside production any header value works; in
+production it must match PROFILE_TOKEN. Profiles are written to PROFILE_DIR as
+pstats files (open with `python -m pstats` or snakeviz).
+"""
+import cProfile
+import hmac
+import logging
+import os
+import random
+import time
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+
+def _wants_profile(sample_rate, token, allow_any_header):
+    header = request.headers.get('X-Profile')
+    if header:
+        if allow_any_header:
+            return True
+        if token and hmac.compare_digest(header, token):
+            return True
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def init_app(app):
+    sample_rate = app.config.get('PROFILE_SAMPLE_RATE', 0.0)
+    token = app.config.get('PROFILE_TOKEN')
+    allow_any_header = app.config.get('PROFILE_ALLOW_HEADER', False)
+    profile_dir = app.config.get('PROFILE_DIR')
+    if not profile_dir or not (sample_rate > 0 or token or allow_any_header):
+        return
+
+    @app.before_request
+    def start_profile():
+        if _wants_profile(sample_rate, token, allow_any_header):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is already active on this thread
+                return
+            g.profiler = profiler
+            g.profile_start = time.perf_counter()
+
+    @app.teardown_request
+    def dump_profile(exc):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return
+        profiler.disable()
+
+        elapsed_ms = (time.perf_counter() - g.pop('profile_start')) * 1000
+        endpoint = (request.endpoint or 'unknown').replace('.', '-')
+        filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.method}-{endpoint}-{elapsed_ms:.0f}ms-{os.getpid()}.prof"
+        try:
+            os.makedirs(profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(profile_dir, filename))
+            logger.info(f"Wrote request profile {filename}")
+        except OSError as e:
+            logger.error(f"Could not write request profile: {e}")
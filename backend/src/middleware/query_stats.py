@@ -0,0 +1,90 @@
+"""Per-request SQL statement counting and N+1 detection.
+
+Engine events time every statement executed while a request is active. At the
+end of the request, statement shapes repeated N_PLUS_ONE_THRESHOLD times or
+more are logged as likely N+1 lazy loads. Outside production the totals are
+also returned as X-DB-* response headers.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_HEADERS = ['X-DB-Query-Count', 'X-DB-Time-Ms', 'X-DB-N-Plus-One']
+
+_WHITESPACE = re.compile(r'\s+')
+# "IN (%(id_1_1)s, %(id_1_2)s, ...)" renders differently per list length
+_PARAM_LIST = re.compile(r'\(\s*(?:%\(\w+\)s|\?)(?:\s*,\s*(?:%\(\w+\)s|\?))*\s*\)')
+
+
+def statement_shape(statement):
+    """Normalize a statement so repeats with different parameters compare equal."""
+    return _PARAM_LIST.sub('(?)', _WHITESPACE.sub(' ', statement).strip())
+
+
+class RequestQueryStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def repeated(self, threshold):
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get('query_start_time')
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+    if not has_request_context():
+        return
+    stats = g.get('query_stats')
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats.shapes[statement_shape(statement)] += 1
+
+
+def init_app(app):
+    if not app.config.get('QUERY_STATS_ENABLED', True):
+        return
+
+    threshold = app.config.get('N_PLUS_ONE_THRESHOLD', 5)
+    add_headers = app.config.get('QUERY_STATS_HEADERS', False)
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = RequestQueryStats()
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = g.pop('query_stats', None)
+        if stats is None:
+            return response
+
+        repeated = stats.repeated(threshold)
+        for shape, n in repeated:
+            logger.warning(f"Possible N+1 on {request.method} {request.path}: "
+                           f"{n}x {shape[:200]}")
+        logger.debug(f"{request.method} {request.path}: {stats.count} queries "
+                     f"in {stats.seconds * 1000:.1f}ms")
+
+        if add_headers:
+            response.headers['X-DB-Query-Count'] = str(stats.count)
+            response.headers['X-DB-Time-Ms'] = f"{stats.seconds * 1000:.1f}"
+            response.headers['X-DB-N-Plus-One'] = str(len(repeated))
+        return response
@@ -4,4 +4,6 @@ from .db import db
 from .user import User
 from .media import Media
 from .user_media import UserMedia
-from .genre import Genre
\ No newline at end of file
+from .genre import Genre
+from .follow import Follow
+from .activity import ActivityEvent, TimelineEntry
\ No newline at end of file
@@ -0,0 +1,67 @@
+from datetime import datetime
+from .db import db
+
+class ActivityEvent(db.Model):
+    __tablename__ = 'activity_events'
+    __table_args__ = (
+        # Fan-out-on-read and follow backfill read a user's latest events
+        db.Index('idx_activity_events_user', 'user_id', 'id'),
+        # get_feed reads the newest pull_on_read events of each pulled followee
+        db.Index('idx_activity_events_pull', 'user_id', 'id',
+                 postgresql_where=db.text('pull_on_read')),
+        # Backs ON DELETE CASCADE from media and the media GC's reference check
+        db.Index('idx_activity_events_media', 'media_id'),
+        {'schema': 'public'}
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('public.users.id', ondelete='CASCADE'), nullable=False)
+    media_id = db.Column(db.Integer, db.ForeignKey('public.media.id', ondelete='CASCADE'), nullable=False)
+    event_type = db.Column(db.String(20), nullable=False)  # 'added', 'status_changed', 'rated'
+    status = db.Column(db.String(20), nullable=True)
+    rating = db.Column(db.Integer, nullable=True)
+    # Not fanned out (actor had too many followers); merged into feeds at read time
+    pull_on_read = db.Column(db.Boolean, nullable=False, default=False, server_default='false')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    user = db.relationship('User')
+    media = db.relationship('Media')
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'event_type': self.event_type,
+            'user': {
+                'id': self.user.id,
+                'username': self.user.username
+            } if self.user else None,
+            'media': {
+                'id': self.media.id,
+                'external_id': self.media.external_id,
+                'type': self.media.type,
+                'title': self.media.title,
+                'image_url': self.media.image_url
+            } if self.media else None,
+            'status': self.status,
+            'rating': self.rating,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class TimelineEntry(db.Model):
+    """One event in a follower's precomputed feed (fan-out-on-write).
+    
+    The (owner_id, event_id) primary key makes a feed page a single index
+    range scan.
+    """
+    __tablename__ = 'timeline_entries'
+    __table_args__ = (
+        # Back ON DELETE CASCADE from activity_events and users
+        db.Index('idx_timeline_entries_event', 'event_id'),
+        db.Index('idx_timeline_entries_actor', 'actor_id'),
+        {'schema': 'public'}
+    )
+    
+    owner_id = db.Column(db.Integer, db.ForeignKey('public.users.id', ondelete='CASCADE'), primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('public.activity_events.id', ondelete='CASCADE'), primary_key=True)
+    # Denormalized so unfollowing can drop entries without joining events
+    actor_id = db.Column(db.Integer, db.ForeignKey('public.users.id', ondelete='CASCADE'), nullable=False)
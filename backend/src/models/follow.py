@@ -0,0 +1,26 @@
+from datetime import datetime
+from .db import db
+
+class Follow(db.Model):
+    __tablename__ = 'follows'
+    __table_args__ = (
+        # Fan-out looks up all followers of a user
+        db.Index('idx_follows_followee', 'followee_id', 'follower_id'),
+        # get_feed looks up only the followees whose events are pulled at read time
+        db.Index('idx_follows_pull', 'follower_id', 'followee_id',
+                 postgresql_where=db.text('followee_has_pull')),
+        {'schema': 'public'}
+    )
+    
+    follower_id = db.Column(db.Integer, db.ForeignKey('public.users.id', ondelete='CASCADE'), primary_key=True)
+    followee_id = db.Column(db.Integer, db.ForeignKey('public.users.id', ondelete='CASCADE'), primary_key=True)
+    # Copy of the followee's users.has_pull_events
+    followee_has_pull = db.Column(db.Boolean, nullable=False, default=False, server_default='false')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'follower_id': self.follower_id,
+            'followee_id': self.followee_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -2,8 +2,8 @@ from .db import db
 
 # Fix association table - add schema and full references
 media_genres = db.Table('media_genres',
-    db.Column('media_id', db.Integer, db.ForeignKey('public.media.id'), primary_key=True),
-    db.Column('genre_id', db.Integer, db.ForeignKey('public.genres.id'), primary_key=True),
+    db.Column('media_id', db.Integer, db.ForeignKey('public.media.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('genre_id', db.Integer, db.ForeignKey('public.genres.id', ondelete='CASCADE'), primary_key=True),
     schema='public'  # Add schema specification here
 )
 
@@ -27,8 +27,10 @@ class Media(db.Model):
     publisher = db.Column(db.String(100), nullable=True)
     
     # Relationships - FIX: remove conflicting definitions
-    user_media_items = db.relationship('UserMedia', back_populates='media', cascade='all, delete-orphan')
-    genres = db.relationship('Genre', secondary='public.media_genres', back_populates='media')
+    user_media_items = db.relationship('UserMedia', back_populates='media', cascade='all, delete-orphan',
+                                       passive_deletes=True)
+    genres = db.relationship('Genre', secondary='public.media_genres', back_populates='media',
+                             passive_deletes=True)
     
     def to_dict(self):
         result = {
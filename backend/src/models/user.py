@@ -12,9 +12,16 @@ class User(db.Model):
     password_hash = db.Column(db.String(200), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_private = db.Column(db.Boolean, default=True)
+    # Maintained on follow/unfollow; decides fan-out-on-write vs fan-out-on-read
+    follower_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Set once any of the user's events was left for fan-out-on-read; sticky so
+    # those events stay visible if follower_count drops back under the threshold
+    has_pull_events = db.Column(db.Boolean, nullable=False, default=False, server_default='false')
     
-    # Relationship with user_media items
-    user_media = db.relationship('UserMedia', back_populates='user', lazy=True, cascade='all, delete-orphan')
+    # Relationship with user_media items - rows are removed by the database
+    # (ON DELETE CASCADE), so don't load them just to delete them
+    user_media = db.relationship('UserMedia', back_populates='user', lazy=True,
+                                 cascade='all, delete-orphan', passive_deletes=True)
     
     def set_password(self, password):
         print(f"Setting password for user {self.username}")
@@ -31,5 +38,6 @@ class User(db.Model):
             'username': self.username,
             'email': self.email,
             'is_private': self.is_private,
+            'follower_count': self.follower_count,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
\ No newline at end of file
@@ -9,8 +9,8 @@ class UserMedia(db.Model):
     )
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('public.users.id'), nullable=False)
-    media_id = db.Column(db.Integer, db.ForeignKey('public.media.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('public.users.id', ondelete='CASCADE'), nullable=False)
+    media_id = db.Column(db.Integer, db.ForeignKey('public.media.id', ondelete='CASCADE'), nullable=False)
     status = db.Column(db.String(20), nullable=False)
     rating = db.Column(db.Integer, nullable=True)
     review = db.Column(db.Text, nullable=True)
@@ -1,27 +1,32 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-from ..controllers import auth_controller
+from .lazy import LazyView
 
 auth_bp = Blueprint('auth', __name__)
 
+_register = LazyView('src.controllers.auth_controller.register')
+_login = LazyView('src.controllers.auth_controller.login')
+_verify = LazyView('src.controllers.auth_controller.verify')
+_refresh = LazyView('src.controllers.auth_controller.refresh')
+
 @auth_bp.route('/register', methods=['POST', 'OPTIONS'])
 def register():
     if request.method == 'OPTIONS':
         return '', 200
-    return auth_controller.register()
+    return _register()
 
 @auth_bp.route('/login', methods=['POST', 'OPTIONS'])
 def login():
     if request.method == 'OPTIONS':
         return '', 200
-    return auth_controller.login()
+    return _login()
 
 @auth_bp.route('/verify', methods=['GET'])
 @jwt_required()
 def verify_token():
-    return auth_controller.verify()
+    return _verify()
 
 @auth_bp.route('/refresh', methods=['POST'])
 @jwt_required()
 def refresh_token():
-    return auth_controller.refresh()
\ No newline at end of file
+    return _refresh()
\ No newline at end of file
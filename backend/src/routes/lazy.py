@@ -0,0 +1,23 @@
+from werkzeug.utils import import_string
+
+
+class LazyView:
+    """View that imports its controller on first call.
+
+    Keeps controllers (and the models they pull in) off the import path of
+    create_app(), so cold starts only pay for them when a request needs them.
+    """
+
+    def __init__(self, import_name):
+        self.__module__, self.__name__ = import_name.rsplit('.', 1)
+        self.import_name = import_name
+        self._view = None
+
+    @property
+    def view(self):
+        if self._view is None:
+            self._view = import_string(self.import_name)
+        return self._view
+
+    def __call__(self, *args, **kwargs):
+        return self.view(*args, **kwargs)
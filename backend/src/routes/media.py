@@ -1,9 +1,14 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required
-from ..controllers.media_controller import get_user_media, add_media_item, update_media_item, delete_media_item
+from .lazy import LazyView
 
 media_bp = Blueprint('media', __name__)
 
+get_user_media = LazyView('src.controllers.media_controller.get_user_media')
+add_media_item = LazyView('src.controllers.media_controller.add_media_item')
+update_media_item = LazyView('src.controllers.media_controller.update_media_item')
+delete_media_item = LazyView('src.controllers.media_controller.delete_media_item')
+
 # All endpoints require authentication
 media_bp.route('/', methods=['GET'])(jwt_required()(get_user_media))
 media_bp.route('/', methods=['POST'])(jwt_required()(add_media_item))
@@ -25,4 +30,4 @@ def add_new_media():
 @jwt_required()
 def get_all_media():
     print("Received GET request to /api/media")
-    return get_user_media()
\ No newline at end of file
+    return get_user_media()
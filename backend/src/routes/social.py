@@ -0,0 +1,14 @@
+from flask import Blueprint
+from flask_jwt_extended import jwt_required
+from .lazy import LazyView
+
+social_bp = Blueprint('social', __name__)
+
+follow = LazyView('src.controllers.social_controller.follow')
+unfollow = LazyView('src.controllers.social_controller.unfollow')
+feed = LazyView('src.controllers.social_controller.feed')
+
+# All endpoints require authentication
+social_bp.route('/follow/<int:user_id>', methods=['POST'])(jwt_required()(follow))
+social_bp.route('/follow/<int:user_id>', methods=['DELETE'])(jwt_required()(unfollow))
+social_bp.route('/feed', methods=['GET'])(jwt_required()(feed))
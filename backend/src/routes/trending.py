@@ -0,0 +1,9 @@
+from flask import Blueprint
+from flask_jwt_extended import jwt_required
+from .lazy import LazyView
+
+trending_bp = Blueprint('trending', __name__)
+
+get_trending = LazyView('src.controllers.trending_controller.get_trending')
+
+trending_bp.route('', methods=['GET'])(jwt_required()(get_trending))
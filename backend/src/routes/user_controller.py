@@ -1,16 +1,20 @@
 from flask import Blueprint
-from ..controllers import user
+from .lazy import LazyView
 
 user_bp = Blueprint('user', __name__)
 
+_get_profile = LazyView('src.controllers.user.get_profile')
+_update_profile = LazyView('src.controllers.user.update_profile')
+_delete_account = LazyView('src.controllers.user.delete_account')
+
 @user_bp.route('/profile', methods=['GET'])
 def get_profile():
-    return user.get_profile()
+    return _get_profile()
 
 @user_bp.route('/profile', methods=['PUT'])
 def update_profile():
-    return user.update_profile()
+    return _update_profile()
 
 @user_bp.route('/account', methods=['DELETE'])
 def delete_account():
-    return user.delete_account()
\ No newline at end of file
+    return _delete_account()
\ No newline at end of file
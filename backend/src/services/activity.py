@@ -0,0 +1,205 @@
+from flask import current_app
+from sqlalchemy import text
+from sqlalchemy.orm import joinedload
+from ..models.db import db
+from ..models.user import User
+from ..models.follow import Follow
+from ..models.activity import ActivityEvent, TimelineEntry
+
+# Recent events copied into a timeline when following someone
+FOLLOW_BACKFILL_EVENTS = 20
+
+
+def _fanout_threshold():
+    return current_app.config.get('FEED_FANOUT_MAX_FOLLOWERS', 10000)
+
+
+def record_activity(user_id, media_id, event_type, status=None, rating=None):
+    """Record an activity event and fan it out to the actor's followers.
+
+    Runs inside the caller's transaction (nothing is committed here). Events of
+    users with at least FEED_FANOUT_MAX_FOLLOWERS followers are not fanned out;
+    get_feed() pulls them in at read time instead. Timelines are trimmed back
+    to TIMELINE_MAX_ENTRIES by the periodic `trim-timelines` job, not here.
+    """
+    user_id = int(user_id)
+    event = ActivityEvent(
+        user_id=user_id,
+        media_id=media_id,
+        event_type=event_type,
+        status=status,
+        rating=rating
+    )
+    db.session.add(event)
+    db.session.flush()
+
+    actor = db.session.get(User, user_id)
+    if actor is None or actor.is_private:
+        return event
+    if actor.follower_count >= _fanout_threshold():
+        event.pull_on_read = True
+        if not actor.has_pull_events:
+            # Once per user: mark their follow rows so get_feed finds them
+            # through the idx_follows_pull partial index
+            actor.has_pull_events = True
+            db.session.execute(text("""
+                UPDATE public.follows
+                SET followee_has_pull = TRUE
+                WHERE followee_id = :actor_id
+            """), {'actor_id': user_id})
+        db.session.flush()
+        return event
+
+    db.session.execute(text("""
+        INSERT INTO public.timeline_entries (owner_id, event_id, actor_id)
+        SELECT follower_id, :event_id, :actor_id
+        FROM public.follows
+        WHERE followee_id = :actor_id
+    """), {'event_id': event.id, 'actor_id': user_id})
+
+    return event
+
+
+def trim_timelines(batch_size, max_batches=None):
+    """Drop timeline entries beyond the newest TIMELINE_MAX_ENTRIES per owner.
+
+    Owners are walked in id order, batch_size per transaction. For each owner
+    the cutoff is found by an index range scan of at most max_entries + 1 rows
+    on the (owner_id, event_id) primary key, and only older entries are deleted.
+    """
+    max_entries = current_app.config.get('TIMELINE_MAX_ENTRIES', 500)
+    trimmed = 0
+    batches = 0
+    last_owner = 0
+    while max_batches is None or batches < max_batches:
+        owner_ids = db.session.execute(text("""
+            SELECT id FROM public.users
+            WHERE id > :last_owner
+            ORDER BY id
+            LIMIT :batch_size
+        """), {'last_owner': last_owner, 'batch_size': batch_size}).scalars().all()
+        if not owner_ids:
+            break
+
+        result = db.session.execute(text("""
+            DELETE FROM public.timeline_entries t
+            USING (
+                SELECT o.owner_id, cutoff.event_id
+                FROM unnest(CAST(:owner_ids AS integer[])) AS o(owner_id)
+                CROSS JOIN LATERAL (
+                    SELECT event_id FROM public.timeline_entries
+                    WHERE owner_id = o.owner_id
+                    ORDER BY event_id DESC
+                    OFFSET :max_entries
+                    LIMIT 1
+                ) cutoff
+            ) c
+            WHERE t.owner_id = c.owner_id
+              AND t.event_id <= c.event_id
+        """), {'owner_ids': list(owner_ids), 'max_entries': max_entries})
+        db.session.commit()
+
+        trimmed += result.rowcount
+        batches += 1
+        last_owner = owner_ids[-1]
+        if len(owner_ids) < batch_size:
+            break
+
+    return trimmed
+
+
+def follow_user(follower_id, followee):
+    """Make follower_id follow followee; returns False if already following."""
+    follower_id = int(follower_id)
+    if db.session.get(Follow, (follower_id, followee.id)):
+        return False
+
+    db.session.add(Follow(
+        follower_id=follower_id,
+        followee_id=followee.id,
+        followee_has_pull=followee.has_pull_events
+    ))
+    User.query.filter_by(id=followee.id).update(
+        {User.follower_count: User.follower_count + 1}, synchronize_session=False
+    )
+
+    # pull_on_read events are merged at read time, so only backfill the rest
+    db.session.execute(text("""
+        INSERT INTO public.timeline_entries (owner_id, event_id, actor_id)
+        SELECT :owner_id, id, user_id
+        FROM public.activity_events
+        WHERE user_id = :followee_id AND NOT pull_on_read
+        ORDER BY id DESC
+        LIMIT :backfill
+        ON CONFLICT DO NOTHING
+    """), {'owner_id': follower_id, 'followee_id': followee.id, 'backfill': FOLLOW_BACKFILL_EVENTS})
+
+    db.session.commit()
+    return True
+
+
+def unfollow_user(follower_id, followee_id):
+    """Stop following followee_id; returns False if not following."""
+    follower_id = int(follower_id)
+    deleted = Follow.query.filter_by(follower_id=follower_id, followee_id=followee_id).delete()
+    if not deleted:
+        return False
+
+    User.query.filter_by(id=followee_id).update(
+        {User.follower_count: User.follower_count - 1}, synchronize_session=False
+    )
+    TimelineEntry.query.filter_by(owner_id=follower_id, actor_id=followee_id).delete()
+    db.session.commit()
+    return True
+
+
+def get_feed(user_id, before=None, limit=20):
+    """Return (events, next_before) for a user's activity feed, newest first.
+
+    The precomputed timeline is read with one range scan on its primary key;
+    pull_on_read events are merged in from activity_events: the followees that
+    have any come from the idx_follows_pull partial index, and each one's
+    newest events from idx_activity_events_pull, at most `limit` per followee.
+    Private actors are filtered out before the page is cut, so pages are only
+    short at the end.
+    """
+    user_id = int(user_id)
+
+    timeline = db.select(TimelineEntry.event_id).join(
+        User, User.id == TimelineEntry.actor_id
+    ).where(
+        TimelineEntry.owner_id == user_id,
+        User.is_private.is_(False)
+    )
+    if before:
+        timeline = timeline.where(TimelineEntry.event_id < before)
+    timeline = timeline.order_by(TimelineEntry.event_id.desc()).limit(limit)
+    event_ids = set(db.session.execute(timeline).scalars())
+
+    before_clause = "AND id < :before" if before else ""
+    pulled = db.session.execute(text(f"""
+        SELECT e.id
+        FROM public.follows f
+        JOIN public.users u ON u.id = f.followee_id AND NOT u.is_private
+        CROSS JOIN LATERAL (
+            SELECT id FROM public.activity_events
+            WHERE user_id = f.followee_id AND pull_on_read {before_clause}
+            ORDER BY id DESC
+            LIMIT :limit
+        ) e
+        WHERE f.follower_id = :user_id AND f.followee_has_pull
+        ORDER BY e.id DESC
+        LIMIT :limit
+    """), {'user_id': user_id, 'before': before, 'limit': limit})
+    event_ids.update(pulled.scalars())
+
+    page_ids = sorted(event_ids, reverse=True)[:limit]
+    if not page_ids:
+        return [], None
+
+    events = ActivityEvent.query.options(
+        joinedload(ActivityEvent.user), joinedload(ActivityEvent.media)
+    ).filter(ActivityEvent.id.in_(page_ids)).order_by(ActivityEvent.id.desc()).all()
+
+    next_before = page_ids[-1] if len(page_ids) == limit else None
+    return events, next_before
@@ -0,0 +1,305 @@
+import logging
+from flask import current_app
+from sqlalchemy import text
+from ..models.db import db
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DELETE_BATCH_SIZE = 500
+DEFAULT_GC_BATCH_SIZE = 500
+
+
+def _batch_size(key, default):
+    return int(current_app.config.get(key, default))
+
+
+def _delete_user_rows(table, user_id, batch_size):
+    """Delete a user's rows from table, batch_size rows per transaction."""
+    deleted = 0
+    while True:
+        result = db.session.execute(text(f"""
+            DELETE FROM public.{table}
+            WHERE id IN (
+                SELECT id FROM public.{table}
+                WHERE user_id = :user_id
+                LIMIT :batch_size
+            )
+        """), {'user_id': user_id, 'batch_size': batch_size})
+        db.session.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+def _delete_follows(user_id, batch_size):
+    """Delete follow rows to and from a user, batch_size rows per transaction.
+
+    follows has no id column, so batches are picked by the other side of its
+    (follower_id, followee_id) key. Dropping the user's own follows decrements
+    the followees' follower_count in the same statement.
+    """
+    deleted = 0
+    while True:
+        result = db.session.execute(text("""
+            DELETE FROM public.follows
+            WHERE followee_id = :user_id
+              AND follower_id IN (
+                  SELECT follower_id FROM public.follows
+                  WHERE followee_id = :user_id
+                  LIMIT :batch_size
+              )
+        """), {'user_id': user_id, 'batch_size': batch_size})
+        db.session.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            break
+
+    while True:
+        followee_ids = db.session.execute(text("""
+            WITH gone AS (
+                DELETE FROM public.follows
+                WHERE follower_id = :user_id
+                  AND followee_id IN (
+                      SELECT followee_id FROM public.follows
+                      WHERE follower_id = :user_id
+                      LIMIT :batch_size
+                  )
+                RETURNING followee_id
+            )
+            UPDATE public.users
+            SET follower_count = follower_count - 1
+            WHERE id IN (SELECT followee_id FROM gone)
+            RETURNING id
+        """), {'user_id': user_id, 'batch_size': batch_size}).scalars().all()
+        db.session.commit()
+        deleted += len(followee_ids)
+        if len(followee_ids) < batch_size:
+            return deleted
+
+
+def delete_user_account(user_id, batch_size=None):
+    """Delete a user and everything they track without loading any rows.
+
+    user_media and activity_events rows (and, through ON DELETE CASCADE, the
+    copies of those events in followers' timelines) and follow rows in both
+    directions are removed in bounded batches, one transaction each, so a large
+    account never holds row locks for long. The final user delete relies on
+    ON DELETE CASCADE for anything inserted meanwhile.
+    """
+    batch_size = batch_size or _batch_size('DELETE_BATCH_SIZE', DEFAULT_DELETE_BATCH_SIZE)
+
+    deleted = _delete_user_rows('user_media', user_id, batch_size)
+    events = _delete_user_rows('activity_events', user_id, batch_size)
+    follows = _delete_follows(user_id, batch_size)
+
+    # A follow added since the batches still cascades; keep counts in step
+    db.session.execute(text("""
+        UPDATE public.users
+        SET follower_count = follower_count - 1
+        WHERE id IN (SELECT followee_id FROM public.follows WHERE follower_id = :user_id)
+    """), {'user_id': user_id})
+
+    result = db.session.execute(
+        text("DELETE FROM public.users WHERE id = :user_id"),
+        {'user_id': user_id}
+    )
+    db.session.commit()
+    logger.info(f"Deleted user {user_id}, {deleted} tracked media items, {events} activity events "
+                f"and {follows} follows")
+    return result.rowcount > 0
+
+
+def dedupe_media(batch_size, max_batches=None):
+    """Merge Media rows sharing (type, external_id) into the lowest id.
+
+    Each batch handles up to batch_size duplicate groups: user_media,
+    activity_events and media_genres rows are repointed to the kept row
+    (dropping ones the user or genre already has there) and the duplicates
+    are deleted.
+    """
+    merged = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        pairs = db.session.execute(text("""
+            SELECT m.id, k.keep_id
+            FROM public.media m
+            JOIN (
+                SELECT type, external_id, MIN(id) AS keep_id
+                FROM public.media
+                GROUP BY type, external_id
+                HAVING COUNT(*) > 1
+                LIMIT :batch_size
+            ) k ON m.type = k.type AND m.external_id = k.external_id AND m.id <> k.keep_id
+        """), {'batch_size': batch_size}).fetchall()
+        if not pairs:
+            break
+
+        params = {
+            'dup_ids': [p[0] for p in pairs],
+            'keep_ids': [p[1] for p in pairs],
+        }
+        mapping = """
+            WITH dup_map AS (
+                SELECT * FROM unnest(CAST(:dup_ids AS integer[]), CAST(:keep_ids AS integer[]))
+                    AS t(dup_id, keep_id)
+            )
+        """
+
+        # Lock the duplicates first: an add_media_item holding one finishes
+        # before we repoint, and new ones wait and then find the kept row
+        db.session.execute(
+            text("SELECT id FROM public.media WHERE id = ANY(:dup_ids) ORDER BY id FOR UPDATE"),
+            params
+        )
+
+        # Users tracking several copies keep one row per surviving media: the
+        # one already on the kept row, else their most recently updated one
+        db.session.execute(text(mapping + """
+            , group_media AS (
+                SELECT dup_id AS media_id, keep_id FROM dup_map
+                UNION
+                SELECT keep_id, keep_id FROM dup_map
+            ), ranked AS (
+                SELECT um.id,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY um.user_id, gm.keep_id
+                           ORDER BY (um.media_id = gm.keep_id) DESC, um.updated_at DESC NULLS LAST, um.id
+                       ) AS rn
+                FROM public.user_media um
+                JOIN group_media gm ON um.media_id = gm.media_id
+            )
+            DELETE FROM public.user_media
+            WHERE id IN (SELECT id FROM ranked WHERE rn > 1)
+        """), params)
+        db.session.execute(text(mapping + """
+            UPDATE public.user_media um
+            SET media_id = dup_map.keep_id
+            FROM dup_map
+            WHERE um.media_id = dup_map.dup_id
+        """), params)
+        db.session.execute(text(mapping + """
+            UPDATE public.activity_events ae
+            SET media_id = dup_map.keep_id
+            FROM dup_map
+            WHERE ae.media_id = dup_map.dup_id
+        """), params)
+        db.session.execute(text(mapping + """
+            INSERT INTO public.media_genres (media_id, genre_id)
+            SELECT dup_map.keep_id, mg.genre_id
+            FROM public.media_genres mg
+            JOIN dup_map ON mg.media_id = dup_map.dup_id
+            ON CONFLICT DO NOTHING
+        """), params)
+        db.session.execute(
+            text("DELETE FROM public.media_genres WHERE media_id = ANY(:dup_ids)"),
+            params
+        )
+        db.session.execute(
+            text("DELETE FROM public.media WHERE id = ANY(:dup_ids)"),
+            params
+        )
+        db.session.commit()
+
+        merged += len(pairs)
+        batches += 1
+
+    return merged
+
+
+def purge_orphaned_media(batch_size, max_batches=None):
+    """Delete Media rows no user tracks any more, batch_size rows at a time.
+
+    Media still named by an activity event is kept, since deleting it would
+    cascade into the event and every follower's timeline copy of it.
+    """
+    purged = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        # Rows locked by add_media_item (or by a user_media insert's foreign
+        # key check) are skipped; they are about to be tracked again
+        media_ids = db.session.execute(text("""
+            SELECT m.id FROM public.media m
+            WHERE NOT EXISTS (
+                SELECT 1 FROM public.user_media um WHERE um.media_id = m.id
+            )
+              AND NOT EXISTS (
+                SELECT 1 FROM public.activity_events ae WHERE ae.media_id = m.id
+            )
+            ORDER BY m.id
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        """), {'batch_size': batch_size}).scalars().all()
+        if not media_ids:
+            break
+
+        # Re-check inside the delete so media tracked since the SELECT survives;
+        # new references now wait on our row locks
+        result = db.session.execute(text("""
+            DELETE FROM public.media m
+            WHERE m.id = ANY(:media_ids)
+              AND NOT EXISTS (
+                  SELECT 1 FROM public.user_media um WHERE um.media_id = m.id
+              )
+              AND NOT EXISTS (
+                  SELECT 1 FROM public.activity_events ae WHERE ae.media_id = m.id
+              )
+        """), {'media_ids': list(media_ids)})
+        db.session.execute(text("""
+            DELETE FROM public.media_genres mg
+            WHERE mg.media_id = ANY(:media_ids)
+              AND NOT EXISTS (SELECT 1 FROM public.media m WHERE m.id = mg.media_id)
+        """), {'media_ids': list(media_ids)})
+        db.session.commit()
+
+        purged += result.rowcount
+        batches += 1
+        if len(media_ids) < batch_size:
+            break
+
+    return purged
+
+
+def purge_orphaned_media_genres(batch_size, max_batches=None):
+    """Delete media_genres rows pointing at media or genres that no longer exist.
+
+    Only databases created before the ON DELETE CASCADE foreign keys can hold
+    such rows.
+    """
+    purged = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        result = db.session.execute(text("""
+            DELETE FROM public.media_genres
+            WHERE (media_id, genre_id) IN (
+                SELECT mg.media_id, mg.genre_id
+                FROM public.media_genres mg
+                WHERE NOT EXISTS (SELECT 1 FROM public.media m WHERE m.id = mg.media_id)
+                   OR NOT EXISTS (SELECT 1 FROM public.genres g WHERE g.id = mg.genre_id)
+                LIMIT :batch_size
+            )
+        """), {'batch_size': batch_size})
+        db.session.commit()
+
+        purged += result.rowcount
+        batches += 1
+        if result.rowcount < batch_size:
+            break
+
+    return purged
+
+
+def run_media_gc(batch_size=None, max_batches=None):
+    """Run one incremental garbage collection pass over media tables.
+
+    Meant to be scheduled periodically (see the `gc-media` CLI command);
+    max_batches bounds how much work a single pass does.
+    """
+    batch_size = batch_size or _batch_size('MEDIA_GC_BATCH_SIZE', DEFAULT_GC_BATCH_SIZE)
+
+    stats = {
+        'media_merged': dedupe_media(batch_size, max_batches),
+        'media_purged': purge_orphaned_media(batch_size, max_batches),
+        'media_genres_purged': purge_orphaned_media_genres(batch_size, max_batches),
+    }
+    logger.info(f"Media GC finished: {stats}")
+    return stats
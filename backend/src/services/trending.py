@@ -0,0 +1,414 @@
+"""In-house trending, computed from UserMedia writes.
+
+Every committed UserMedia insert (and status/rating update) increments a
+count-min sketch for the current time bucket of its media type. A sliding
+window of buckets gives each media item an approximate recent count, and a
+heap keeps the top-K candidates per media type, so /api/trending is served
+from memory without ever scanning user_media.
+
+Each process checkpoints the increments it saw to trending_buckets and
+trending_candidates from a background thread, off the request path, and once
+more when it exits. Sketches are merged by addition, so several workers
+converge on the same counts.
+"""
+import atexit
+import heapq
+import logging
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from random import Random
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session, object_session
+from ..models.db import db
+from ..models.user_media import UserMedia
+
+logger = logging.getLogger(__name__)
+
+SKETCH_WIDTH = 2048
+SKETCH_DEPTH = 4
+MEDIA_CACHE_SIZE = 10000
+
+_PRIME = (1 << 61) - 1
+# Fixed seed: every process must hash media ids the same way to merge sketches
+_HASH_PARAMS = [(Random(row).randrange(1, _PRIME), Random(-row - 1).randrange(_PRIME))
+                for row in range(SKETCH_DEPTH)]
+
+_SESSION_KEY = 'trending_events'
+
+
+class CountMinSketch:
+    """Count-min sketch over integer keys, stored as SKETCH_DEPTH rows of uint32."""
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH, counts=None):
+        self.width = width
+        self.depth = depth
+        self.counts = counts if counts is not None else array('I', bytes(4 * width * depth))
+
+    def _cells(self, key):
+        for row in range(self.depth):
+            a, b = _HASH_PARAMS[row]
+            yield row * self.width + ((a * key + b) % _PRIME) % self.width
+
+    def add(self, key, count=1):
+        for cell in self._cells(key):
+            self.counts[cell] += count
+
+    def estimate(self, key):
+        return min(self.counts[cell] for cell in self._cells(key))
+
+    def merge(self, other):
+        for i, count in enumerate(other.counts):
+            if count:
+                self.counts[i] += count
+
+    def copy(self):
+        return CountMinSketch(self.width, self.depth, array('I', self.counts))
+
+    def to_bytes(self):
+        counts = array('I', self.counts)
+        if sys.byteorder == 'big':
+            counts.byteswap()
+        return counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        counts = array('I')
+        counts.frombytes(bytes(data))
+        if sys.byteorder == 'big':
+            counts.byteswap()
+        if len(counts) != width * depth:
+            return None
+        return cls(width, depth, counts)
+
+
+class TrendingTracker:
+    """Sliding-window trending counts with a heap-based top-K per media type."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.window_buckets = 28
+        self.bucket_seconds = 6 * 3600
+        self.top_k = 20
+        self.checkpoint_seconds = 300
+
+        self._current = None
+        self._buckets = {}     # bucket -> {media_type: CountMinSketch}
+        self._pending = {}     # increments not yet checkpointed, same shape
+        self._candidates = {}  # media_type -> {media_id: score}
+        self._heaps = {}       # media_type -> [(score, media_id)], may hold stale entries
+        self._ranked = {}      # media_type -> cached ranking served by the API
+        self._media = OrderedDict()  # media_id -> summary dict (LRU)
+
+        self._app = None
+        self._worker_pid = None
+        self._checkpointing = False
+
+    def init_app(self, app):
+        self.bucket_seconds = app.config.get('TRENDING_BUCKET_HOURS', 6) * 3600
+        self.window_buckets = max(1, app.config.get('TRENDING_WINDOW_HOURS', 168) * 3600 // self.bucket_seconds)
+        self.top_k = app.config.get('TRENDING_TOP_K', 20)
+        self.checkpoint_seconds = app.config.get('TRENDING_CHECKPOINT_SECONDS', 300)
+        app.extensions['trending'] = self
+        self._app = app
+
+    # Recording
+
+    def record(self, media_id, summary, count=1, now=None):
+        media_type = summary['type']
+        bucket = int((time.time() if now is None else now) // self.bucket_seconds)
+        self._start_worker()
+        with self._lock:
+            self._advance(bucket)
+            if bucket < self._current - self.window_buckets + 1:
+                return
+            for store in (self._buckets, self._pending):
+                sketch = store.setdefault(bucket, {}).get(media_type)
+                if sketch is None:
+                    sketch = store[bucket][media_type] = CountMinSketch()
+                sketch.add(media_id, count)
+            self._remember(media_id, summary)
+            self._offer(media_type, media_id, self._estimate(media_type, media_id))
+
+    def _estimate(self, media_type, media_id):
+        return sum(sketches[media_type].estimate(media_id)
+                   for sketches in self._buckets.values() if media_type in sketches)
+
+    def _offer(self, media_type, media_id, score):
+        candidates = self._candidates.setdefault(media_type, {})
+        heap = self._heaps.setdefault(media_type, [])
+
+        if media_id not in candidates and len(candidates) >= self.top_k:
+            # Pop stale heap entries until the real minimum is on top
+            while heap and candidates.get(heap[0][1]) != heap[0][0]:
+                heapq.heappop(heap)
+            if heap and score <= heap[0][0]:
+                return
+            _, evicted = heapq.heappop(heap)
+            del candidates[evicted]
+
+        candidates[media_id] = score
+        heapq.heappush(heap, (score, media_id))
+        if len(heap) > 4 * self.top_k:
+            self._rebuild_heap(media_type)
+        self._ranked.pop(media_type, None)
+
+    def _rebuild_heap(self, media_type):
+        heap = [(score, media_id) for media_id, score in self._candidates.get(media_type, {}).items()]
+        heapq.heapify(heap)
+        self._heaps[media_type] = heap
+
+    def _advance(self, bucket):
+        """Slide the window forward to bucket, rescoring candidates if it moved."""
+        if self._current is not None and bucket <= self._current:
+            return
+        self._current = bucket
+        oldest = bucket - self.window_buckets + 1
+        for store in (self._buckets, self._pending):
+            for stale in [b for b in store if b < oldest]:
+                del store[stale]
+        self._rescore()
+
+    def _rescore(self, extra=None):
+        """Recompute candidate scores from the sketches and keep the top K."""
+        for media_type in set(self._candidates) | set(extra or {}):
+            ids = set(self._candidates.get(media_type, {})) | set((extra or {}).get(media_type, ()))
+            scored = [(self._estimate(media_type, media_id), media_id) for media_id in ids]
+            top = heapq.nlargest(self.top_k, (entry for entry in scored if entry[0] > 0))
+            self._candidates[media_type] = {media_id: score for score, media_id in top}
+            self._rebuild_heap(media_type)
+        self._ranked.clear()
+
+    def _remember(self, media_id, summary):
+        self._media[media_id] = summary
+        self._media.move_to_end(media_id)
+        while len(self._media) > MEDIA_CACHE_SIZE:
+            self._media.popitem(last=False)
+
+    def media_summary(self, connection, media_id):
+        """Return the cached media summary, querying by primary key on a miss."""
+        summary = self._media.get(media_id)
+        if summary is None:
+            row = connection.execute(text("""
+                SELECT id, external_id, type, title, image_url
+                FROM public.media WHERE id = :media_id
+            """), {'media_id': media_id}).mappings().first()
+            summary = dict(row) if row else None
+        return summary
+
+    # Serving
+
+    def get_trending(self, media_type, limit=None):
+        """Return the current top items for a media type, highest score first.
+
+        Until the first checkpoint has loaded the shared state this only
+        reflects what the current process has recorded (usually nothing).
+        """
+        self._start_worker()
+        limit = min(limit or self.top_k, self.top_k)
+        with self._lock:
+            ranked = self._ranked.get(media_type)
+            if ranked is None:
+                candidates = self._candidates.get(media_type, {})
+                ranked = [
+                    {'media': self._media[media_id], 'score': score}
+                    for media_id, score in sorted(candidates.items(), key=lambda item: -item[1])
+                    if media_id in self._media
+                ]
+                self._ranked[media_type] = ranked
+            return ranked[:limit]
+
+    # Checkpointing
+
+    def _start_worker(self):
+        """Start the checkpoint thread in this process on first use.
+
+        Started lazily rather than in init_app() so that create_app() stays
+        free of database work and each forked worker gets its own thread.
+        """
+        if self._worker_pid == os.getpid() or self._app is None:
+            return
+        with self._lock:
+            if self._worker_pid == os.getpid():
+                return
+            self._worker_pid = os.getpid()
+        threading.Thread(target=self._run_checkpoints, name='trending-checkpoint', daemon=True).start()
+        atexit.register(self._checkpoint_on_exit, os.getpid())
+
+    def _checkpoint_on_exit(self, pid):
+        """Write out increments recorded since the last checkpoint.
+
+        Runs on normal interpreter exit (including a gunicorn worker shutting
+        down); a process that is killed or frozen loses what is pending.
+        """
+        # Handlers registered before a fork are inherited by the children
+        if pid != os.getpid() or not self._pending:
+            return
+        # Let a checkpoint already in flight finish, then flush what is left
+        deadline = time.time() + 10
+        while self._checkpointing and time.time() < deadline:
+            time.sleep(0.05)
+        try:
+            with self._app.app_context():
+                self.checkpoint()
+        except Exception as e:
+            logger.error(f"Trending checkpoint on exit failed: {e}")
+
+    def _run_checkpoints(self):
+        while True:
+            try:
+                with self._app.app_context():
+                    self.checkpoint()
+            except Exception as e:
+                logger.error(f"Trending checkpoint thread error: {e}")
+            time.sleep(self.checkpoint_seconds)
+
+    def checkpoint(self):
+        """Merge local increments into the database and reload the merged window."""
+        with self._lock:
+            if self._checkpointing:
+                return
+            self._checkpointing = True
+            self._advance(int(time.time() // self.bucket_seconds))
+            pending, self._pending = self._pending, {}
+            local_candidates = {media_type: list(c) for media_type, c in self._candidates.items()}
+            oldest = self._current - self.window_buckets + 1
+
+        try:
+            buckets, candidates, summaries = self._sync(pending, local_candidates, oldest)
+        except Exception as e:
+            logger.error(f"Trending checkpoint failed: {e}")
+            with self._lock:
+                # Keep the increments for the next attempt
+                for bucket, sketches in pending.items():
+                    for media_type, sketch in sketches.items():
+                        current = self._pending.setdefault(bucket, {}).get(media_type)
+                        if current is None:
+                            self._pending[bucket][media_type] = sketch
+                        else:
+                            current.merge(sketch)
+                self._checkpointing = False
+            return
+
+        with self._lock:
+            # Increments recorded while we were talking to the database
+            for bucket, sketches in self._pending.items():
+                for media_type, sketch in sketches.items():
+                    merged = buckets.setdefault(bucket, {}).get(media_type)
+                    if merged is None:
+                        buckets[bucket][media_type] = sketch.copy()
+                    else:
+                        merged.merge(sketch)
+            self._buckets = buckets
+            for media_id, summary in summaries.items():
+                self._remember(media_id, summary)
+            self._rescore(candidates)
+            self._checkpointing = False
+
+    def _sync(self, pending, local_candidates, oldest):
+        with db.engine.begin() as conn:
+            # Fixed lock order so concurrent workers can't deadlock
+            for bucket, sketches in sorted(pending.items()):
+                for media_type, delta in sorted(sketches.items()):
+                    if bucket < oldest:
+                        continue
+                    conn.execute(text("""
+                        INSERT INTO public.trending_buckets (media_type, bucket, sketch)
+                        VALUES (:media_type, :bucket, :sketch)
+                        ON CONFLICT (media_type, bucket) DO NOTHING
+                    """), {'media_type': media_type, 'bucket': bucket, 'sketch': CountMinSketch().to_bytes()})
+                    stored = conn.execute(text("""
+                        SELECT sketch FROM public.trending_buckets
+                        WHERE media_type = :media_type AND bucket = :bucket
+                        FOR UPDATE
+                    """), {'media_type': media_type, 'bucket': bucket}).scalar()
+                    merged = CountMinSketch.from_bytes(stored) or CountMinSketch()
+                    merged.merge(delta)
+                    conn.execute(text("""
+                        UPDATE public.trending_buckets SET sketch = :sketch
+                        WHERE media_type = :media_type AND bucket = :bucket
+                    """), {'media_type': media_type, 'bucket': bucket, 'sketch': merged.to_bytes()})
+
+            conn.execute(text("DELETE FROM public.trending_buckets WHERE bucket < :oldest"), {'oldest': oldest})
+
+            buckets = {}
+            for media_type, bucket, sketch in conn.execute(text("""
+                SELECT media_type, bucket, sketch FROM public.trending_buckets
+            """)):
+                sketch = CountMinSketch.from_bytes(sketch)
+                if sketch is not None:
+                    buckets.setdefault(bucket, {})[media_type] = sketch
+
+            # Candidate ids are shared across workers; each checkpoint adds its own
+            candidates = {}
+            for media_type, media_ids in conn.execute(text("""
+                SELECT media_type, media_ids FROM public.trending_candidates
+            """)):
+                candidates[media_type] = set(media_ids or [])
+            for media_type, media_ids in local_candidates.items():
+                candidates.setdefault(media_type, set()).update(media_ids)
+
+            for media_type, media_ids in candidates.items():
+                scored = sorted(
+                    ((sum(s[media_type].estimate(media_id) for s in buckets.values() if media_type in s), media_id)
+                     for media_id in media_ids),
+                    reverse=True
+                )
+                candidates[media_type] = [media_id for score, media_id in scored[:self.top_k] if score > 0]
+                conn.execute(text("""
+                    INSERT INTO public.trending_candidates (media_type, media_ids)
+                    VALUES (:media_type, :media_ids)
+                    ON CONFLICT (media_type) DO UPDATE SET media_ids = EXCLUDED.media_ids
+                """), {'media_type': media_type, 'media_ids': candidates[media_type]})
+
+            missing = [media_id for ids in candidates.values() for media_id in ids if media_id not in self._media]
+            summaries = {}
+            if missing:
+                for row in conn.execute(text("""
+                    SELECT id, external_id, type, title, image_url
+                    FROM public.media WHERE id = ANY(:media_ids)
+                """), {'media_ids': missing}).mappings():
+                    summaries[row['id']] = dict(row)
+
+        return buckets, candidates, summaries
+
+
+trending = TrendingTracker()
+
+
+# Feed the tracker from committed UserMedia writes. Events are queued on the
+# session during flush and only applied once the transaction commits.
+
+def _queue(connection, target):
+    session = object_session(target)
+    if session is None:
+        return
+    summary = trending.media_summary(connection, target.media_id)
+    if summary is not None:
+        session.info.setdefault(_SESSION_KEY, []).append((target.media_id, summary))
+
+
+@event.listens_for(UserMedia, 'after_insert')
+def _user_media_inserted(mapper, connection, target):
+    _queue(connection, target)
+
+
+@event.listens_for(UserMedia, 'after_update')
+def _user_media_updated(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.status.history.has_changes() or state.attrs.rating.history.has_changes():
+        _queue(connection, target)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_trending_events(session):
+    for media_id, summary in session.info.pop(_SESSION_KEY, ()):
+        trending.record(media_id, summary)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_trending_events(session):
+    session.info.pop(_SESSION_KEY, None)
@@ -0,0 +1,27 @@
+-- Switch existing databases to DB-side cascading deletes.
+-- Constraint names are the PostgreSQL defaults generated by create_tables.sql.
+
+-- User_Media -> Users / Media
+ALTER TABLE user_media DROP CONSTRAINT IF EXISTS user_media_user_id_fkey;
+ALTER TABLE user_media
+    ADD CONSTRAINT user_media_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+
+ALTER TABLE user_media DROP CONSTRAINT IF EXISTS user_media_media_id_fkey;
+ALTER TABLE user_media
+    ADD CONSTRAINT user_media_media_id_fkey
+    FOREIGN KEY (media_id) REFERENCES media(id) ON DELETE CASCADE;
+
+-- Media_Genres -> Media / Genres
+ALTER TABLE media_genres DROP CONSTRAINT IF EXISTS media_genres_media_id_fkey;
+ALTER TABLE media_genres
+    ADD CONSTRAINT media_genres_media_id_fkey
+    FOREIGN KEY (media_id) REFERENCES media(id) ON DELETE CASCADE;
+
+ALTER TABLE media_genres DROP CONSTRAINT IF EXISTS media_genres_genre_id_fkey;
+ALTER TABLE media_genres
+    ADD CONSTRAINT media_genres_genre_id_fkey
+    FOREIGN KEY (genre_id) REFERENCES genres(id) ON DELETE CASCADE;
+
+-- Lookup index used by media deduplication
+CREATE INDEX IF NOT EXISTS idx_media_type_external_id ON media(type, external_id);
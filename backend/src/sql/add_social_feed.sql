@@ -0,0 +1,58 @@
+-- Add follows, activity events and per-user timelines to existing databases.
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS follower_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS has_pull_events BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Create Follows table
+CREATE TABLE IF NOT EXISTS follows (
+    follower_id INTEGER NOT NULL,
+    followee_id INTEGER NOT NULL,
+    followee_has_pull BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (follower_id, followee_id),
+    FOREIGN KEY (follower_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (followee_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Create Activity_Events table
+CREATE TABLE IF NOT EXISTS activity_events (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    media_id INTEGER NOT NULL,
+    event_type VARCHAR(20) NOT NULL CHECK(event_type IN ('added', 'status_changed', 'rated')),
+    status VARCHAR(20),
+    rating INTEGER,
+    pull_on_read BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (media_id) REFERENCES media(id) ON DELETE CASCADE
+);
+
+-- Create Timeline_Entries table (per-follower feed, fan-out-on-write)
+CREATE TABLE IF NOT EXISTS timeline_entries (
+    owner_id INTEGER NOT NULL,
+    event_id INTEGER NOT NULL,
+    actor_id INTEGER NOT NULL,
+    PRIMARY KEY (owner_id, event_id),
+    FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (event_id) REFERENCES activity_events(id) ON DELETE CASCADE,
+    FOREIGN KEY (actor_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Databases that ran an earlier version of this script
+ALTER TABLE activity_events ADD COLUMN IF NOT EXISTS pull_on_read BOOLEAN NOT NULL DEFAULT FALSE;
+ALTER TABLE follows ADD COLUMN IF NOT EXISTS followee_has_pull BOOLEAN NOT NULL DEFAULT FALSE;
+UPDATE follows f
+SET followee_has_pull = TRUE
+FROM users u
+WHERE u.id = f.followee_id AND u.has_pull_events AND NOT f.followee_has_pull;
+
+CREATE INDEX IF NOT EXISTS idx_follows_followee ON follows(followee_id, follower_id);
+CREATE INDEX IF NOT EXISTS idx_activity_events_user ON activity_events(user_id, id);
+CREATE INDEX IF NOT EXISTS idx_follows_pull ON follows(follower_id, followee_id) WHERE followee_has_pull;
+CREATE INDEX IF NOT EXISTS idx_activity_events_pull ON activity_events(user_id, id) WHERE pull_on_read;
+
+-- Foreign keys with ON DELETE CASCADE need an index on the referencing side
+CREATE INDEX IF NOT EXISTS idx_activity_events_media ON activity_events(media_id);
+CREATE INDEX IF NOT EXISTS idx_timeline_entries_event ON timeline_entries(event_id);
+CREATE INDEX IF NOT EXISTS idx_timeline_entries_actor ON timeline_entries(actor_id);
@@ -0,0 +1,15 @@
+-- Add checkpoint storage for in-house trending to existing databases.
+
+-- Create Trending_Buckets table (count-min sketch per media type and time bucket)
+CREATE TABLE IF NOT EXISTS trending_buckets (
+    media_type VARCHAR(20) NOT NULL,
+    bucket BIGINT NOT NULL,  -- epoch seconds // (TRENDING_BUCKET_HOURS * 3600)
+    sketch BYTEA NOT NULL,
+    PRIMARY KEY (media_type, bucket)
+);
+
+-- Create Trending_Candidates table (current top-K media ids per media type)
+CREATE TABLE IF NOT EXISTS trending_candidates (
+    media_type VARCHAR(20) PRIMARY KEY,
+    media_ids INTEGER[] NOT NULL DEFAULT '{}'
+);
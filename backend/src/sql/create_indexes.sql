@@ -3,12 +3,22 @@ CREATE INDEX idx_user_media_user ON user_media(user_id);
 CREATE INDEX idx_user_media_media ON user_media(media_id);
 CREATE INDEX idx_media_genres_media ON media_genres(media_id);
 CREATE INDEX idx_media_genres_genre ON media_genres(genre_id);
+CREATE INDEX idx_activity_events_media ON activity_events(media_id);
+CREATE INDEX idx_timeline_entries_event ON timeline_entries(event_id);
+CREATE INDEX idx_timeline_entries_actor ON timeline_entries(actor_id);
 
 -- Frequently queried fields
 CREATE INDEX idx_users_username ON users(username);
 CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_media_external_id ON media(external_id);
+CREATE INDEX idx_media_type_external_id ON media(type, external_id);
 
 -- Composite indexes
 CREATE INDEX idx_user_media_composite ON user_media(user_id, media_id);
-CREATE INDEX idx_media_genres_composite ON media_genres(media_id, genre_id);
\ No newline at end of file
+CREATE INDEX idx_media_genres_composite ON media_genres(media_id, genre_id);
+CREATE INDEX idx_follows_followee ON follows(followee_id, follower_id);
+CREATE INDEX idx_activity_events_user ON activity_events(user_id, id);
+
+-- Partial indexes for the read-time (pull) side of the activity feed
+CREATE INDEX idx_follows_pull ON follows(follower_id, followee_id) WHERE followee_has_pull;
+CREATE INDEX idx_activity_events_pull ON activity_events(user_id, id) WHERE pull_on_read;
\ No newline at end of file
@@ -3,7 +3,9 @@ CREATE TABLE users (
     id SERIAL PRIMARY KEY,
     username VARCHAR(50) NOT NULL UNIQUE,
     email VARCHAR(100) NOT NULL UNIQUE,
-    password_hash VARCHAR(255) NOT NULL
+    password_hash VARCHAR(255) NOT NULL,
+    follower_count INTEGER NOT NULL DEFAULT 0,
+    has_pull_events BOOLEAN NOT NULL DEFAULT FALSE
 );
 
 -- Create Media table
@@ -37,8 +39,8 @@ CREATE TABLE user_media (
     rating INTEGER CHECK(rating BETWEEN 1 AND 5),
     review TEXT,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
-    FOREIGN KEY (user_id) REFERENCES users(id),
-    FOREIGN KEY (media_id) REFERENCES media(id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (media_id) REFERENCES media(id) ON DELETE CASCADE,
     UNIQUE(user_id, media_id)
 );
 
@@ -54,6 +56,56 @@ CREATE TABLE media_genres (
     media_id INTEGER NOT NULL,
     genre_id INTEGER NOT NULL,
     PRIMARY KEY (media_id, genre_id),
-    FOREIGN KEY (media_id) REFERENCES media(id),
-    FOREIGN KEY (genre_id) REFERENCES genres(id)
+    FOREIGN KEY (media_id) REFERENCES media(id) ON DELETE CASCADE,
+    FOREIGN KEY (genre_id) REFERENCES genres(id) ON DELETE CASCADE
+);
+
+-- Create Follows table
+CREATE TABLE follows (
+    follower_id INTEGER NOT NULL,
+    followee_id INTEGER NOT NULL,
+    followee_has_pull BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (follower_id, followee_id),
+    FOREIGN KEY (follower_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (followee_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Create Activity_Events table
+CREATE TABLE activity_events (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    media_id INTEGER NOT NULL,
+    event_type VARCHAR(20) NOT NULL CHECK(event_type IN ('added', 'status_changed', 'rated')),
+    status VARCHAR(20),
+    rating INTEGER,
+    pull_on_read BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (media_id) REFERENCES media(id) ON DELETE CASCADE
+);
+
+-- Create Timeline_Entries table (per-follower feed, fan-out-on-write)
+CREATE TABLE timeline_entries (
+    owner_id INTEGER NOT NULL,
+    event_id INTEGER NOT NULL,
+    actor_id INTEGER NOT NULL,
+    PRIMARY KEY (owner_id, event_id),
+    FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (event_id) REFERENCES activity_events(id) ON DELETE CASCADE,
+    FOREIGN KEY (actor_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Create Trending_Buckets table (count-min sketch per media type and time bucket)
+CREATE TABLE trending_buckets (
+    media_type VARCHAR(20) NOT NULL,
+    bucket BIGINT NOT NULL,  -- epoch seconds // (TRENDING_BUCKET_HOURS * 3600)
+    sketch BYTEA NOT NULL,
+    PRIMARY KEY (media_type, bucket)
+);
+
+-- Create Trending_Candidates table (current top-K media ids per media type)
+CREATE TABLE trending_candidates (
+    media_type VARCHAR(20) PRIMARY KEY,
+    media_ids INTEGER[] NOT NULL DEFAULT '{}'
 );
\ No newline at end of file
@@ -1,3 +1,16 @@
+-- Drop Trending tables
+DROP TABLE IF EXISTS trending_candidates;
+DROP TABLE IF EXISTS trending_buckets;
+
+-- Drop Timeline_Entries table
+DROP TABLE IF EXISTS timeline_entries;
+
+-- Drop Activity_Events table
+DROP TABLE IF EXISTS activity_events;
+
+-- Drop Follows table
+DROP TABLE IF EXISTS follows;
+
 -- Drop Media_Genres table
 DROP TABLE IF EXISTS media_genres;
 